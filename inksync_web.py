@@ -1,16 +1,27 @@
+import gzip
+import hashlib
 import json
+import mimetypes
 import os
 import time
 from datetime import datetime, date
 from enum import Enum
 
 import requests
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, abort, render_template, jsonify, request, send_from_directory
 from werkzeug.utils import secure_filename
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 
-app = Flask(__name__, static_folder='static', template_folder='templates')
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Static files are served by our own "static" endpoint (see below) so they can be
+# fingerprinted, precompressed and cached; url_for('static', ...) keeps working.
+app = Flask(__name__, static_folder=None, template_folder='templates')
+STATIC_DIR = os.path.join(app.root_path, 'static')
 
 # --- Directories ---
 MODULES_DIR = 'modules'
@@ -58,34 +69,121 @@ class ModuleType(str, Enum):
 # --- Default config ---
 DEFAULT_CONFIG = {f"KEY{i}": [None, None] for i in range(9)}
 
+# ------------------ Static assets & page cache ------------------
+# Assets are hashed and compressed once at startup; responses are picked by
+# Accept-Encoding. Debug mode bypasses both caches so edits show up immediately.
+STATIC_MAX_AGE = 31536000  # one year, for fingerprinted (?v=<hash>) URLs
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+def _build_asset(body: bytes, mimetype: str) -> dict:
+    """Return a cache entry with content hash and identity/gzip/br variants."""
+    asset = {
+        "hash": hashlib.sha256(body).hexdigest()[:12],
+        "mimetype": mimetype,
+        "variants": {"identity": body},
+    }
+    if mimetype.startswith(COMPRESSIBLE_TYPES):
+        compressed = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli:
+            compressed["br"] = brotli.compress(body, quality=11)
+        for encoding, data in compressed.items():
+            if len(data) < len(body):
+                asset["variants"][encoding] = data
+    return asset
+
+def _load_static_assets() -> dict:
+    """Read every file under static/ into memory, keyed by its url_for filename."""
+    assets = {}
+    for root, _dirs, files in os.walk(STATIC_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            filename = os.path.relpath(path, STATIC_DIR).replace(os.sep, "/")
+            mimetype = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            with open(path, "rb") as f:
+                assets[filename] = _build_asset(f.read(), mimetype)
+    return assets
+
+STATIC_ASSETS = _load_static_assets()
+PAGE_CACHE = {}
+
+def _asset_response(asset: dict, max_age: int = 0) -> Response:
+    """Serve the best encoding the client accepts, with ETag revalidation."""
+    encoding = "identity"
+    for candidate in ("br", "gzip"):
+        if candidate in asset["variants"] and request.accept_encodings[candidate]:
+            encoding = candidate
+            break
+
+    resp = Response(asset["variants"][encoding], mimetype=asset["mimetype"])
+    if encoding != "identity":
+        resp.headers["Content-Encoding"] = encoding
+    if len(asset["variants"]) > 1:
+        resp.vary.add("Accept-Encoding")
+    resp.set_etag(f"{asset['hash']}-{encoding}")
+    if max_age:
+        resp.headers["Cache-Control"] = f"public, max-age={max_age}, immutable"
+    else:
+        resp.headers["Cache-Control"] = "no-cache"
+    return resp.make_conditional(request)
+
+@app.url_defaults
+def _fingerprint_static_url(endpoint, values):
+    """Append the content hash to url_for('static', ...) so URLs change with content."""
+    if endpoint == "static" and not app.debug:
+        asset = STATIC_ASSETS.get(values.get("filename"))
+        if asset:
+            values.setdefault("v", asset["hash"])
+
+@app.route('/static/<path:filename>', endpoint='static')
+def static_file(filename):
+    if app.debug:
+        return send_from_directory(STATIC_DIR, filename)
+    asset = STATIC_ASSETS.get(filename)
+    if not asset:
+        abort(404)
+    # Only the current fingerprint may be cached forever; stale/missing ?v= revalidates.
+    immutable = request.args.get("v") == asset["hash"]
+    return _asset_response(asset, STATIC_MAX_AGE if immutable else 0)
+
+def render_page(template: str, title: str, key: str):
+    """Render a page shell once per route and serve it from memory afterwards."""
+    if app.debug:
+        return render_template(template, title=title, key=key)
+    cache_key = (template, title, key)
+    asset = PAGE_CACHE.get(cache_key)
+    if asset is None:
+        html = render_template(template, title=title, key=key).encode("utf-8")
+        asset = PAGE_CACHE[cache_key] = _build_asset(html, "text/html")
+    return _asset_response(asset)
+
 # ------------------ Page routes ------------------
 @app.route('/')
 def home():
-    return render_template('index.html', title='Device', key='device')
+    return render_page('index.html', title='Device', key='device')
 
 @app.route('/layout')
 def layout():
-    return render_template('layout.html', title='Layout', key='layout')
+    return render_page('layout.html', title='Layout', key='layout')
 
 @app.route('/automation')
 def automation():
-    return render_template('automation.html', title='Automation', key='automation')
+    return render_page('automation.html', title='Automation', key='automation')
 
 @app.route('/settings')
 def settings():
-    return render_template('settings.html', title='Settings', key='settings')
+    return render_page('settings.html', title='Settings', key='settings')
 
 @app.route('/settings/auth_google')
 def auth_page_google():
-    return render_template('auth_google.html', title='Settings - Google', key='settings')
+    return render_page('auth_google.html', title='Settings - Google', key='settings')
 
 @app.route('/settings/auth_microsoft')
 def auth_page_microsoft():
-    return render_template('auth_microsoft.html', title='Settings - Microsoft', key='settings')
+    return render_page('auth_microsoft.html', title='Settings - Microsoft', key='settings')
 
 @app.route('/events')
 def events():
-    return render_template('events.html', title='Events', key='events')
+    return render_page('events.html', title='Events', key='events')
 
 # ------------------ Config API ------------------
 @app.get("/api/config/<uuid>")
@@ -671,4 +769,4 @@ if __name__ == "__main__":
     for d in [MODULES_DIR, CONFIG_DIR, EVENTS_DIR, LAYOUT_DIR, AUTOMATIONS_DIR, CREDENTIALS_DIR]:
         os.makedirs(d, exist_ok=True)
     create_state()
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    app.run(host='0.0.0.0', port=5000, debug=os.environ.get("INKSYNC_DEBUG", "0") == "1")